@@ -11,6 +11,7 @@ import random
 import chess
 import argparse
 from schemas import ChessMoveResponse
+from pydantic import ValidationError
 from openai import OpenAI
 
 class ChessLLMAgent:
@@ -464,7 +465,7 @@ class ChessLLMAgent:
         if "Error" not in output and self.chess_board:
             try:
                 chess_move = chess.Move.from_uci(move)
-                if chess_move in self.chess_board.legal_moves:
+                if self.chess_board.is_legal(chess_move):
                     self.chess_board.push(chess_move)
                     
                     # Also check for and apply the computer's move if it's in the output
@@ -475,7 +476,7 @@ class ChessLLMAgent:
                             computer_move = computer_move_match.group(1)
                             try:
                                 computer_chess_move = chess.Move.from_uci(computer_move)
-                                if computer_chess_move in self.chess_board.legal_moves:
+                                if self.chess_board.is_legal(computer_chess_move):
                                     self.chess_board.push(computer_chess_move)
                             except ValueError:
                                 print(f"Warning: Could not parse computer move: {computer_move}")
@@ -564,7 +565,6 @@ class ChessLLMAgent:
         valid_moves = self.get_valid_moves()
         
         # First look for JSON structure in the response
-        import json
         import re
         
         # Try to extract JSON from the response (it might be embedded in other text)
@@ -583,20 +583,17 @@ class ChessLLMAgent:
                     continue
                     
                 try:
-                    # Try to parse as JSON
-                    move_data = json.loads(match)
+                    # Parse and validate the expected structure in one pass
+                    move_data = ChessMoveResponse.model_validate_json(match)
+                    selected_move = move_data.selected_move
                     
-                    # Check if it has the expected structure
-                    if "selected_move" in move_data:
-                        selected_move = move_data["selected_move"]
-                        
-                        # Verify the selected move is in valid moves
-                        if selected_move in valid_moves:
-                            print(f"Successfully parsed structured move: {selected_move}")
-                            return selected_move
-                        else:
-                            print(f"Warning: Selected move {selected_move} is not valid")
-                except json.JSONDecodeError:
+                    # Verify the selected move is in valid moves
+                    if selected_move in valid_moves:
+                        print(f"Successfully parsed structured move: {selected_move}")
+                        return selected_move
+                    else:
+                        print(f"Warning: Selected move {selected_move} is not valid")
+                except ValidationError:
                     print(f"Failed to parse JSON: {match}")
         
         # Fallback to regex if JSON parsing failed
@@ -1,13 +1,56 @@
 import chess
 import uuid
+import functools
+import itertools
 import json
 import os
+import random
+from collections import OrderedDict
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Most that the check bonus and mobility difference can move an evaluation
+# (0.5 for check plus 0.05 per move, with at most 218 legal moves a side)
+_MOBILITY_MARGIN = 0.5 + 218 * 0.05
+
+# Center control and extended center squares used by evaluate_position
+_CENTER_MASK = chess.BB_E4 | chess.BB_D4 | chess.BB_E5 | chess.BB_D5
+_EXT_CENTER_MASK = (
+    chess.BB_C3 | chess.BB_D3 | chess.BB_E3 | chess.BB_F3
+    | chess.BB_C6 | chess.BB_D6 | chess.BB_E6 | chess.BB_F6
+    | chess.BB_C4 | chess.BB_C5 | chess.BB_F4 | chess.BB_F5
+)
+
+# Reasons reported by is_game_over for each way a game can end. Games only
+# end on the automatic 75-move and fivefold rules, which imply the claimable
+# fifty-move and threefold ones.
+_TERMINATION_REASONS = {
+    chess.Termination.CHECKMATE: 'checkmate',
+    chess.Termination.STALEMATE: 'stalemate',
+    chess.Termination.INSUFFICIENT_MATERIAL: 'insufficient material',
+    chess.Termination.SEVENTYFIVE_MOVES: 'fifty-move rule',
+    chess.Termination.FIVEFOLD_REPETITION: 'threefold repetition',
+}
+
+# Evaluations of recently seen positions, shared by all engines and keyed by
+# the board's transposition key (oldest first, capped at _EVAL_CACHE_SIZE)
+_EVAL_CACHE = OrderedDict()
+_EVAL_CACHE_SIZE = 1 << 16
+
 class ChessEngine:
     """
     A chess engine that maintains game state and provides methods for gameplay.
     """
+    __slots__ = (
+        'autosave_dir', 'autosave', 'autosave_path', 'move_timestamps',
+        'strategy_name', 'board', 'initial_fen', 'game_id', '_text_cache',
+        '_uci_history',
+    )
+    
     def __init__(self, load_path=None, autosave=True, autosave_dir="chess_autosaves", game_id=None, strategy_name=None):
         """
         Initialize a new chess engine.
@@ -27,14 +70,21 @@ class ChessEngine:
         self.autosave = autosave
         self.move_timestamps = {}
         self.strategy_name = strategy_name
+        # (position key, text) of the last rendered board
+        self._text_cache = (None, None)
+        # UCI strings of the moves saved so far, extended on each save
+        self._uci_history = []
         
         # Either load a game or start a new one
         if load_path:
             self._load_game(load_path)
         else:
             self.board = chess.Board()
+            self.initial_fen = chess.STARTING_FEN
             # Use the provided game_id or generate a new one
-            self.game_id = game_id if game_id is not None else str(uuid.uuid4())
+            if game_id is None:
+                game_id = str(uuid.uuid4())
+            self.game_id = game_id
         
         # Set up autosave path
         self.autosave_path = os.path.join(self.autosave_dir, f"game_id_{self.game_id}.json")
@@ -54,11 +104,11 @@ class ChessEngine:
             IllegalMoveError: If the move is illegal on the current board
         """
         try:
-            move = chess.Move.from_uci(move_uci)
+            move = _move_from_uci(move_uci)
         except ValueError:
             raise ValueError(f"Invalid UCI notation: {move_uci}")
             
-        if move not in self.board.legal_moves:
+        if not self.board.is_legal(move):
             raise IllegalMoveError(f"Illegal move: {move_uci}")
         
         # Make the move
@@ -86,12 +136,12 @@ class ChessEngine:
         if not self.is_computer_turn():
             return None
             
-        legal_moves = list(self.board.legal_moves)
-        if not legal_moves:
+        # Pick an index and walk the generator to it instead of building a list
+        num_moves = self.board.legal_moves.count()
+        if not num_moves:
             raise ValueError("No legal moves available")
         
-        import random
-        random_move = random.choice(legal_moves)
+        random_move = next(itertools.islice(self.board.legal_moves, random.randrange(num_moves), None))
         self.board.push(random_move)
         
         # Record timestamp for this move
@@ -121,26 +171,50 @@ class ChessEngine:
         """
         return [move.uci() for move in self.board.legal_moves]
     
+    def iter_valid_moves(self):
+        """
+        Iterate over valid moves without converting them to UCI strings.
+        
+        Yields:
+            tuple: (from_square, to_square, promotion) as python-chess square
+                indices and piece type (promotion is None for normal moves)
+        """
+        for move in self.board.generate_legal_moves():
+            yield move.from_square, move.to_square, move.promotion
+    
     def save_game(self, filepath=None):
         """
         Save the current game state to a file.
         
         Args:
             filepath (str, optional): Custom filepath. If None, uses autosave path.
+                Autosaves are written compactly, custom saves are pretty-printed.
         
         Returns:
             str: Path to the saved game file
         """
-        if filepath is None:
+        is_autosave = filepath is None
+        if is_autosave:
             filepath = self.autosave_path
         
+        # Only convert the moves made since the last save, so saving stays
+        # cheap as the game grows. Start over if moves were taken back since,
+        # which either shortens the stack or replaces the last saved move.
+        history = self._uci_history
+        move_stack = self.board.move_stack
+        if history and (len(history) > len(move_stack)
+                        or move_stack[len(history) - 1].uci() != history[-1]):
+            del history[:]
+        history.extend(move.uci() for move in move_stack[len(history):])
+        
         # Convert move timestamps keys to strings for JSON serialization
         string_move_timestamps = {str(k): v for k, v in self.move_timestamps.items()}
         
         game_data = {
             "game_id": self.game_id,
             "fen": self.board.fen(),
-            "move_history": [move.uci() for move in self.board.move_stack],
+            "initial_fen": self.initial_fen,
+            "move_history": history,
             "move_timestamps": string_move_timestamps,
             "strategy_name": self.strategy_name,
             "last_updated": datetime.now().isoformat()
@@ -149,8 +223,21 @@ class ChessEngine:
         # Ensure the directory exists
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
         
-        with open(filepath, 'w') as f:
-            json.dump(game_data, f, indent=2)
+        # Autosaves happen after every move, so skip the pretty-printer for them
+        if orjson is not None:
+            data = orjson.dumps(game_data, option=0 if is_autosave else orjson.OPT_INDENT_2)
+        else:
+            if is_autosave:
+                data = json.dumps(game_data, separators=(',', ':')).encode()
+            else:
+                data = json.dumps(game_data, indent=2).encode()
+        
+        # Write beside the target and swap it in, so the single rolling autosave
+        # is never seen half-written by anything polling it
+        tmp_path = filepath + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, filepath)
         
         return filepath
     
@@ -180,12 +267,6 @@ class ChessEngine:
             if field not in game_data:
                 raise ValueError(f"Missing required field in game file: {field}")
         
-        # Create board from FEN
-        try:
-            self.board = chess.Board(game_data["fen"])
-        except ValueError as e:
-            raise ValueError(f"Invalid FEN in game file: {str(e)}")
-        
         # Set game ID
         self.game_id = game_data["game_id"]
         
@@ -195,26 +276,42 @@ class ChessEngine:
         
         # Extract move timestamps (convert keys back to integers)
         self.move_timestamps = {}
+        self._uci_history = []
         if "move_timestamps" in game_data:
             self.move_timestamps = {int(k): v for k, v in game_data["move_timestamps"].items()}
         
-        # Optionally replay moves
+        # One board, filled in place by the replay or the FEN fallback
+        board = self.board = chess.Board(None)
+        
+        # Rebuild the board by replaying the move history from the position
+        # the game started in. Older saves don't record it, so assume the
+        # standard starting position and check where the replay ends up.
+        self.initial_fen = game_data.get("initial_fen", chess.STARTING_FEN)
+        replayed = False
         if "move_history" in game_data:
-            # Clear the move stack first (since we loaded from FEN)
-            self.board.clear_stack()
-            # Replay each move
-            for move_uci in game_data["move_history"]:
-                try:
-                    move = chess.Move.from_uci(move_uci)
-                    if move in self.board.legal_moves:
-                        self.board.push(move)
-                    else:
-                        # If we encounter an illegal move in history, stop replaying
-                        # but keep the board state from the valid moves
-                        break
-                except ValueError:
-                    # Skip invalid UCI strings
-                    continue
+            try:
+                board.set_fen(self.initial_fen)
+                for move_uci in game_data["move_history"]:
+                    move = _move_from_uci(move_uci)
+                    # Check just this move rather than generating every legal move
+                    if not board.is_legal(move):
+                        raise ValueError(f"Illegal move in history: {move_uci}")
+                    board.push(move)
+                # Saves without an initial FEN may come from games that were
+                # resumed from a position, only trust the replay if it lands on
+                # the position that was saved
+                replayed = board.fen() == game_data["fen"]
+            except ValueError:
+                # History doesn't replay cleanly, fall back to the saved FEN
+                pass
+        
+        # Set board from FEN
+        if not replayed:
+            try:
+                board.set_fen(game_data["fen"])
+            except ValueError as e:
+                raise ValueError(f"Invalid FEN in game file: {str(e)}")
+            self.initial_fen = board.fen()
     
     def is_game_over(self):
         """
@@ -226,30 +323,23 @@ class ChessEngine:
                 - 'result': The result of the game as a string ("1-0", "0-1", "1/2-1/2", or None)
                 - 'reason': The reason why the game is over (checkmate, stalemate, etc.)
         """
-        result = {
-            'is_over': self.board.is_game_over(),
-            'result': None,
-            'reason': None
-        }
-        
-        if result['is_over']:
-            if self.board.is_checkmate():
-                result['reason'] = 'checkmate'
-                result['result'] = "0-1" if self.board.turn == chess.WHITE else "1-0"
-            elif self.board.is_stalemate():
-                result['reason'] = 'stalemate'
-                result['result'] = "1/2-1/2"
-            elif self.board.is_insufficient_material():
-                result['reason'] = 'insufficient material'
-                result['result'] = "1/2-1/2"
-            elif self.board.is_fifty_moves():
-                result['reason'] = 'fifty-move rule'
-                result['result'] = "1/2-1/2"
-            elif self.board.is_repetition():
-                result['reason'] = 'threefold repetition'
-                result['result'] = "1/2-1/2"
-                
-        return result
+        # A single outcome() call gives both the termination and the result
+        outcome = self.board.outcome()
+        if outcome is None:
+            return {'is_over': False, 'result': None, 'reason': None}
+        
+        termination = outcome.termination
+        reason = _TERMINATION_REASONS.get(termination, termination.name.lower().replace('_', ' '))
+        # outcome() puts insufficient material ahead of stalemate, and fivefold
+        # repetition ahead of a fifty-move count short of 75; keep reporting
+        # stalemate and the fifty-move rule first in those overlaps
+        if termination == chess.Termination.INSUFFICIENT_MATERIAL:
+            if not any(self.board.generate_legal_moves()):
+                reason = 'stalemate'
+        elif termination == chess.Termination.FIVEFOLD_REPETITION:
+            if self.board.is_fifty_moves():
+                reason = 'fifty-move rule'
+        return {'is_over': True, 'result': outcome.result(), 'reason': reason}
     
     def get_current_turn(self):
         """
@@ -269,75 +359,76 @@ class ChessEngine:
         """
         return self.board.is_check()
     
-    def evaluate_position(self):
+    def evaluate_position(self, alpha=None, beta=None):
         """
         Calculate a simple evaluation of the current board position.
         Positive values favor white, negative values favor black.
         
+        Args:
+            alpha (float, optional): Lower bound of the caller's search window
+            beta (float, optional): Upper bound of the caller's search window.
+                If the material score is so far outside the window that mobility
+                can't bring it back, mobility is skipped and the material score
+                is returned as-is.
+        
         Returns:
             float: Evaluation score (positive favors white, negative favors black)
         """
-        # Piece values (standard chess values)
-        piece_values = {
-            chess.PAWN: 1.0,
-            chess.KNIGHT: 3.0,
-            chess.BISHOP: 3.0,
-            chess.ROOK: 5.0,
-            chess.QUEEN: 9.0,
-            chess.KING: 0.0  # King's value isn't counted in material
-        }
-        
-        # Position evaluation weights
-        position_weights = {
-            # Center control
-            chess.E4: 0.3, chess.D4: 0.3, chess.E5: 0.3, chess.D5: 0.3,
-            # Extended center
-            chess.C3: 0.1, chess.D3: 0.1, chess.E3: 0.1, chess.F3: 0.1,
-            chess.C6: 0.1, chess.D6: 0.1, chess.E6: 0.1, chess.F6: 0.1,
-            chess.C4: 0.1, chess.C5: 0.1, chess.F4: 0.1, chess.F5: 0.1
-        }
-        
-        evaluation = 0.0
-        
-        # Count material
-        for square in chess.SQUARES:
-            piece = self.board.piece_at(square)
-            if piece:
-                # Get material value
-                value = piece_values[piece.piece_type]
-                
-                # Add square-specific position value if applicable
-                if square in position_weights:
-                    value += position_weights[square]
-                    
-                # Apply sign based on color
-                value = value if piece.color == chess.WHITE else -value
-                evaluation += value
-        
-        # Check status advantages
-        if self.board.is_checkmate():
-            # Big score for checkmate
-            evaluation = float('-inf') if self.board.turn == chess.WHITE else float('inf')
-        elif self.board.is_check():
-            # Small bonus for giving check
-            evaluation += 0.5 if self.board.turn == chess.BLACK else -0.5
-        
-        # Mobility (number of legal moves)
-        mobility = len(list(self.board.legal_moves))
-        # Save current turn
+        # Positions repeat between redraws and transpositions, so look it up first
+        key = self.board._transposition_key()
+        cached = _EVAL_CACHE.get(key)
+        if cached is not None:
+            _EVAL_CACHE.move_to_end(key)
+            return cached
+        
+        board = self.board
+        white = board.occupied_co[chess.WHITE]
+        black = board.occupied_co[chess.BLACK]
+        
+        # Count material and center occupancy straight from the bitboards
+        evaluation = _material_score(
+            board.pawns & white, board.pawns & black,
+            board.knights & white, board.knights & black,
+            board.bishops & white, board.bishops & black,
+            board.rooks & white, board.rooks & black,
+            board.queens & white, board.queens & black,
+            white, black, _CENTER_MASK, _EXT_CENTER_MASK
+        )
+        
+        # Lazy evaluation: outside the window only the bound matters, so skip
+        # both move generations (unless in check, where mate must be detected)
+        if ((alpha is not None and evaluation + _MOBILITY_MARGIN < alpha)
+                or (beta is not None and evaluation - _MOBILITY_MARGIN > beta)):
+            if not board.is_check():
+                return evaluation
+        
+        # Mobility (number of legal moves), also reused to detect checkmate
+        mobility = self.board.legal_moves.count()
         current_turn = self.board.turn
         
-        # Temporarily switch sides to count opponent's moves
-        self.board.turn = not self.board.turn
-        opponent_mobility = len(list(self.board.legal_moves))
-        # Restore original turn
-        self.board.turn = current_turn
+        # Check status advantages
+        if self.board.is_check():
+            if mobility == 0:
+                # Big score for checkmate
+                evaluation = float('-inf') if current_turn == chess.WHITE else float('inf')
+            else:
+                # Small bonus for giving check
+                evaluation += 0.5 if current_turn == chess.BLACK else -0.5
+        
+        # Pass the turn with a null move to count the opponent's moves
+        self.board.push(chess.Move.null())
+        opponent_mobility = self.board.legal_moves.count()
+        self.board.pop()
         
         # Add small advantage for mobility difference
         mobility_score = (mobility - opponent_mobility) * 0.05
         evaluation += mobility_score if current_turn == chess.WHITE else -mobility_score
         
-        return round(evaluation, 2)
+        _EVAL_CACHE[key] = evaluation
+        if len(_EVAL_CACHE) > _EVAL_CACHE_SIZE:
+            _EVAL_CACHE.popitem(last=False)
+        
+        return evaluation
     
     def get_board_state_text(self):
         """
@@ -346,6 +437,11 @@ class ChessEngine:
         Returns:
             str: Text representation of the board with coordinates
         """
+        # The text only changes when the position does, so reuse the last render
+        key = self.board._transposition_key()
+        if key == self._text_cache[0]:
+            return self._text_cache[1]
+        
         # Convert the standard board string to a list of lines
         board_str = str(self.board).split('\n')
         
@@ -353,12 +449,37 @@ class ChessEngine:
         files = '    a b c d e f g h'
         
         # Construct board representation with rank numbers
-        output = []
-        for i, line in enumerate(board_str):
-            output.append(f' {8-i} {line} {8-i}')
-        output.append(files)
+        text = '\n'.join(f' {8-i} {line} {8-i}' for i, line in enumerate(board_str)) + '\n' + files
+        self._text_cache = (key, text)
         
-        return '\n'.join(output)
+        return text
+
+def _material_score(pawns_w, pawns_b, knights_w, knights_b, bishops_w, bishops_b,
+                    rooks_w, rooks_b, queens_w, queens_b, occupied_w, occupied_b,
+                    center_mask, ext_center_mask):
+    """
+    Score material and center occupancy from raw bitboards.
+    
+    Only does integer popcounts on its arguments, so the whole material pass
+    is a dozen native operations instead of a loop over all 64 squares.
+    
+    Returns:
+        float: Material score (positive favors white, negative favors black)
+    """
+    return (
+        1.0 * (pawns_w.bit_count() - pawns_b.bit_count())
+        + 3.0 * (knights_w.bit_count() - knights_b.bit_count())
+        + 3.0 * (bishops_w.bit_count() - bishops_b.bit_count())
+        + 5.0 * (rooks_w.bit_count() - rooks_b.bit_count())
+        + 9.0 * (queens_w.bit_count() - queens_b.bit_count())
+        + 0.3 * ((occupied_w & center_mask).bit_count() - (occupied_b & center_mask).bit_count())
+        + 0.1 * ((occupied_w & ext_center_mask).bit_count() - (occupied_b & ext_center_mask).bit_count())
+    )
+
+@functools.lru_cache(maxsize=8192)
+def _move_from_uci(move_uci):
+    """Parse a UCI string into a move, memoized since moves are immutable."""
+    return chess.Move.from_uci(move_uci)
 
 # Custom exception for illegal moves
 class IllegalMoveError(Exception):
@@ -1,5 +1,7 @@
-import argparse
 import os
+import sys
+import chess
+from collections import defaultdict
 from chess_engine import ChessEngine, IllegalMoveError
 
 def display_help():
@@ -18,45 +20,79 @@ def display_valid_moves(engine):
     Args:
         engine: ChessEngine instance
     """
-    legal_moves = engine.get_valid_moves()
+    # Group moves by starting square
+    moves_by_square = defaultdict(list)
+    for from_square, to_square, _ in engine.iter_valid_moves():
+        moves_by_square[from_square].append(chess.SQUARE_NAMES[to_square])
     
-    if not legal_moves:
+    if not moves_by_square:
         print("No legal moves available!")
         return
     
-    # Group moves by starting square
-    moves_by_square = {}
-    for move in legal_moves:
-        from_square = move[:2]
-        to_square = move[2:4]
-        if from_square not in moves_by_square:
-            moves_by_square[from_square] = []
-        moves_by_square[from_square].append(to_square)
-    
     # Display moves in organized format
     print("\nValid moves:")
-    for from_square, to_squares in sorted(moves_by_square.items()):
+    piece_at = engine.board.piece_at
+    total_moves = 0
+    for from_square in sorted(moves_by_square, key=chess.SQUARE_NAMES.__getitem__):
+        to_squares = moves_by_square[from_square]
+        total_moves += len(to_squares)
+        
         # Get the piece at this square
-        piece = engine.board.piece_at(chess.parse_square(from_square))
-        piece_symbol = piece.symbol()
+        piece_symbol = piece_at(from_square).symbol()
         
-        # Format the destinations
-        destinations = ", ".join(sorted(to_squares))
+        # Format the destinations, sorting the bucket in place
+        to_squares.sort()
+        destinations = ", ".join(to_squares)
         
-        print(f"  {piece_symbol} at {from_square} → {destinations}")
+        print(f"  {piece_symbol} at {chess.SQUARE_NAMES[from_square]} → {destinations}")
     
-    print(f"Total legal moves: {len(legal_moves)}")
+    print(f"Total legal moves: {total_moves}")
+
+def display_board(engine):
+    """
+    Display the board, current turn, evaluation and check status.
+    
+    Args:
+        engine: ChessEngine instance
+    """
+    # Build everything into one write
+    output = [
+        "\n" + engine.get_board_state_text(),
+        f"\nCurrent turn: {engine.get_current_turn()}"
+    ]
+    
+    # Show evaluation
+    eval_score = engine.evaluate_position()
+    eval_display = f"{eval_score:+.2f}"
+    if eval_score > 0 and eval_display != "+0.00":
+        eval_display = eval_display if eval_score < 100 else "+∞"
+        output.append(f"Evaluation: {eval_display} (White advantage)")
+    elif eval_score < 0 and eval_display != "-0.00":
+        eval_display = eval_display if eval_score > -100 else "-∞"
+        output.append(f"Evaluation: {eval_display} (Black advantage)")
+    else:
+        output.append("Evaluation: 0.00 (Equal position)")
+    
+    # Show check status
+    if engine.is_in_check():
+        output.append(f"{engine.get_current_turn()} is in CHECK!")
+    
+    sys.stdout.write("\n".join(output) + "\n")
 
 def game_loop():
     """
     Main game loop for playing chess against a computer making random moves.
     Allows loading from a saved game or starting a new one.
     """
+    # Only needed when running as a script, not when importing the display helpers
+    import argparse
+    
     parser = argparse.ArgumentParser(description="Chess game with save/load functionality")
     parser.add_argument("--load", help="Load a saved game file")
     parser.add_argument("--autosave", action="store_true", help="Automatically save the game after every move")
     parser.add_argument("--game-id", help="Specify a custom game ID")
     parser.add_argument("--strategy", help="Name of the agent's strategy")
+    parser.add_argument("--quiet", action="store_true", help="Don't display the board or evaluation each turn")
     args = parser.parse_args()
     
     # Create save directory
@@ -92,24 +128,9 @@ def game_loop():
     
     # Main game loop
     while True:
-        # Display the current board
-        print("\n" + engine.get_board_state_text())
-        print(f"\nCurrent turn: {engine.get_current_turn()}")
-        
-        # Show evaluation
-        eval_score = engine.evaluate_position()
-        if eval_score > 0:
-            eval_display = f"+{eval_score}" if eval_score < 100 else "+∞"
-            print(f"Evaluation: {eval_display} (White advantage)")
-        elif eval_score < 0:
-            eval_display = f"{eval_score}" if eval_score > -100 else "-∞"
-            print(f"Evaluation: {eval_display} (Black advantage)")
-        else:
-            print("Evaluation: 0.00 (Equal position)")
-        
-        # Show check status
-        if engine.is_in_check():
-            print(f"{engine.get_current_turn()} is in CHECK!")
+        # Display the current position unless running quietly
+        if not args.quiet:
+            display_board(engine)
         
         # Check if game is over
         status = engine.is_game_over()
@@ -163,9 +184,6 @@ def game_loop():
                 print(f"Error: {e}")
                 break
 
-# Required import for chess square parsing in display_valid_moves
-import chess
-
 # Run the game if script is executed
 if __name__ == "__main__":
     game_loop()
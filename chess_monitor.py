@@ -5,14 +5,34 @@ import time
 import os
 import io
 import tkinter as tk
-from PIL import Image, ImageTk
+from PIL import Image, ImageDraw
 import threading
 import json
 from datetime import datetime
 from cairosvg import svg2png
+import re
+import logging
+import fnmatch
 import glob
+import stat
+import functools
+import queue
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
 import hashlib
-import logging
+import zlib
+
+try:
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
+
+try:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so either can be caught
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
 
 
 # Set up logging
@@ -24,28 +44,296 @@ logging.basicConfig(
 logger = logging.getLogger('ChessMonitor')
 
 
+
+# Rendered board size in pixels, and the layout chess.svg.board uses for it:
+# 45 unit squares inside a 15 unit coordinate margin
+BOARD_SIZE = 350
+BOARD_MARGIN = 15
+BOARD_SCALE = BOARD_SIZE / (8 * chess.svg.SQUARE_SIZE + 2 * BOARD_MARGIN)
+
+# Memory to spend on rendered board images kept around for reuse, and how many
+# RGBA boards that works out to (about 480 KiB each at 350px)
+RENDER_CACHE_BYTES = 64 * 1024 * 1024
+RENDER_CACHE_SIZE = RENDER_CACHE_BYTES // (BOARD_SIZE * BOARD_SIZE * 4)
+
+# Rendered boards are also kept on disk so they survive restarts, one file per
+# board, trimmed back to RENDER_DISK_CACHE_BYTES by least recent use. Bump the
+# version whenever the renderer's output changes, so stale images aren't reused.
+RENDER_DISK_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "chess_monitor", "renders")
+RENDER_DISK_CACHE_BYTES = 256 * 1024 * 1024
+RENDER_SCHEMA_VERSION = 1
+
+# How many renders to install between trims of the on-disk cache
+DISK_CACHE_PRUNE_EVERY = 256
+
+# How long to collect file changes before applying them, so bursts of writes
+# turn into one redraw
+FLUSH_DELAY_MS = 50
+
+# How long a game file has to go without changing before it's redrawn, so the
+# several writes of a single move only cause one render
+FILE_QUIET_MS = 200
+
+# Longest a changed game file waits for that, so files rewritten more often
+# than FILE_QUIET_MS are still redrawn
+FILE_MAX_WAIT_MS = 1000
+
+
+@functools.lru_cache(maxsize=None)
+def board_background():
+    """Rasterize the empty board with its coordinates, once per process."""
+    svg_data = chess.svg.board(chess.BaseBoard(None), size=BOARD_SIZE)
+    return Image.open(io.BytesIO(svg2png(bytestring=svg_data))).convert("RGBA")
+
+
+@functools.lru_cache(maxsize=None)
+def piece_sprite(symbol):
+    """Rasterize a single piece at the board's square size, once per process."""
+    size = round(chess.svg.SQUARE_SIZE * BOARD_SCALE)
+    svg_data = chess.svg.piece(chess.Piece.from_symbol(symbol), size=size)
+    return Image.open(io.BytesIO(svg2png(bytestring=svg_data))).convert("RGBA")
+
+
+def board_fen(fen):
+    """
+    Get the piece placement part of a FEN, which is all the board image shows.
+    Splitting it off is much cheaper than parsing the FEN into a chess.Board.
+    """
+    return fen.split(" ", 1)[0]
+
+
+def format_time(timestamp):
+    """
+    Format an ISO 8601 timestamp as the time of day shown on a game's header.
+    
+    Args:
+        timestamp (str): Timestamp from a game file
+    
+    Returns:
+        str: The time as HH:MM:SS, or the timestamp as is if it isn't ISO 8601
+    """
+    try:
+        return datetime.fromisoformat(timestamp).strftime("%H:%M:%S")
+    except (TypeError, ValueError):
+        return timestamp
+
+
+def square_box(square):
+    """Pixel box (left, top, right, bottom) of a square on the rendered board."""
+    left = BOARD_MARGIN + chess.square_file(square) * chess.svg.SQUARE_SIZE
+    top = BOARD_MARGIN + (7 - chess.square_rank(square)) * chess.svg.SQUARE_SIZE
+    return (
+        round(left * BOARD_SCALE), round(top * BOARD_SCALE),
+        round((left + chess.svg.SQUARE_SIZE) * BOARD_SCALE), round((top + chess.svg.SQUARE_SIZE) * BOARD_SCALE)
+    )
+
+
+def render_board_ppm(placement, last_move_uci=None):
+    """
+    Render a board position to binary PPM data. Runs in the render worker processes.
+    
+    Pieces are pasted onto a copy of the empty board rather than going through
+    chess.svg and cairosvg for the whole board every time.
+    
+    Args:
+        placement (str): Piece placement part of the FEN
+        last_move_uci (str): Optional move to highlight, in UCI format
+    
+    Returns:
+        bytes: The rendered board as a BOARD_SIZE x BOARD_SIZE PPM image
+    """
+    image = board_background().copy()
+    
+    # Highlight the last move's squares in chess.svg's colors
+    if last_move_uci:
+        draw = ImageDraw.Draw(image)
+        last_move = chess.Move.from_uci(last_move_uci)
+        for square in (last_move.from_square, last_move.to_square):
+            shade = "light" if chess.BB_SQUARES[square] & chess.BB_LIGHT_SQUARES else "dark"
+            left, top, right, bottom = square_box(square)
+            draw.rectangle((left, top, right - 1, bottom - 1), fill=chess.svg.DEFAULT_COLORS[f"square {shade} lastmove"])
+    
+    for square, piece in chess.BaseBoard(placement).piece_map().items():
+        sprite = piece_sprite(piece.symbol())
+        image.paste(sprite, square_box(square)[:2], sprite)
+    
+    # Tk reads uncompressed PPM directly, so hand over the pixels behind a PPM
+    # header and the main thread can build the image without going through PIL.
+    # The board is fully opaque, so dropping alpha loses nothing.
+    return b"P6 %d %d 255\n" % image.size + image.convert("RGB").tobytes()
+
+
+def disk_cache_path(cache_dir, placement, last_move_uci):
+    """Path a rendered board is stored at in the on-disk cache."""
+    key = f"{RENDER_SCHEMA_VERSION}:{BOARD_SIZE}:{placement}:{last_move_uci or ''}"
+    return os.path.join(cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".ppm.z")
+
+
+def load_or_render_board(placement, last_move_uci=None, cache_dir=None):
+    """
+    Get a board's PPM data from the on-disk cache, rendering and storing it on
+    a miss. Runs in the render worker processes, so the disk and compression
+    work stays off the Tk main thread.
+    
+    Args:
+        placement (str): Piece placement part of the FEN
+        last_move_uci (str): Optional move to highlight, in UCI format
+        cache_dir (str): Directory of the on-disk cache, or None to skip it
+    
+    Returns:
+        bytes: The rendered board as a BOARD_SIZE x BOARD_SIZE PPM image
+    """
+    if cache_dir is None:
+        return render_board_ppm(placement, last_move_uci)
+    
+    path = disk_cache_path(cache_dir, placement, last_move_uci)
+    try:
+        with open(path, 'rb') as f:
+            ppm_data = zlib.decompress(f.read())
+        # Bump the mtime, which is what trimming goes by
+        os.utime(path)
+        return ppm_data
+    except (OSError, zlib.error):
+        pass
+    
+    ppm_data = render_board_ppm(placement, last_move_uci)
+    
+    # Write beside the entry and rename it into place, so other workers and
+    # monitors sharing the cache never read it half-written
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            # Boards are mostly flat colour, so even fast compression shrinks them a lot
+            f.write(zlib.compress(ppm_data, 1))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Error writing render disk cache: {e}")
+        # Don't leave a partial or orphaned temp file in the cache
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    return ppm_data
+
+
+def prune_disk_cache(cache_dir, max_bytes=RENDER_DISK_CACHE_BYTES):
+    """
+    Delete the least recently used boards from the on-disk cache until it fits
+    in max_bytes. Runs in the render worker processes.
+    """
+    entries = []
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            if entry.name.endswith(".ppm.z"):
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+    
+    # Keep the most recently used entries that fit
+    entries.sort(reverse=True)
+    total = 0
+    for _, size, path in entries:
+        total += size
+        if total > max_bytes:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class GameFileEventHandler:
+    """Watchdog event handler that queues changes to files matching a pattern."""
+    def __init__(self, name_re, events):
+        """
+        Args:
+            name_re (re.Pattern): Compiled pattern the file's base name has to match
+            events (queue.Queue): Queue that receives (kind, path) tuples, where
+                kind is 'changed' or 'deleted'
+        """
+        self.name_re = name_re
+        self.events = events
+    
+    def matches(self, path):
+        return self.name_re.match(os.path.basename(path)) is not None
+    
+    def dispatch(self, event):
+        """Called by the watchdog observer thread for every directory event."""
+        if event.is_directory:
+            return
+        
+        if event.event_type == 'deleted':
+            if self.matches(event.src_path):
+                self.events.put(('deleted', event.src_path))
+        elif event.event_type == 'moved':
+            # A rename onto a game file is how atomic writes land
+            if self.matches(event.src_path):
+                self.events.put(('deleted', event.src_path))
+            if self.matches(event.dest_path):
+                self.events.put(('changed', event.dest_path))
+        elif event.event_type in ('created', 'modified', 'closed'):
+            # Ignore opens and read-only closes, including our own reads
+            if self.matches(event.src_path):
+                self.events.put(('changed', event.src_path))
+
+
 class ChessBoardMonitor:
     def __init__(self, games_pattern="chess_autosaves/game_id_*.json", refresh_rate=1.0, game_timeout=20.0):
         """
         Initialize the chess board monitor application.
         
         Args:
-            games_pattern (str): Pattern to match game files (supports wildcards)
+            games_pattern (str): Pattern to match game files (supports wildcards,
+                also in the directory part)
             refresh_rate (float): How often to check for updates (in seconds)
             game_timeout (float): How long to wait before removing a missing game (in seconds)
         """
         self.games_pattern = games_pattern
+        # Split the pattern once so scans only have to match file names. A
+        # directory with wildcards in it has to be globbed instead, and can't be
+        # watched, so games_dir is None then.
+        games_dir, name_pattern = os.path.split(games_pattern)
+        self.games_dir = games_dir or "."
+        if glob.escape(self.games_dir) != self.games_dir:
+            self.games_dir = None
+        self.game_name_re = re.compile(fnmatch.translate(name_pattern))
         self.refresh_rate = refresh_rate
         self.game_timeout = game_timeout
-        self.boards = {}
+        self.board_fens = {}  # Piece placement of each game's board
         self.board_widgets = {}
         self.game_info = {}  # Store additional game information
         self.game_frames = {}  # Store frames for each game
-        self.last_modified = {}
-        self.game_files = []
+        self.game_labels = {}  # Store header labels for each game, by name
+        self.file_game_ids = {}  # Game ID of each game file, derived once per file
+        self.game_files = set()
+        self.game_indexes = {}  # Grid index of each game file, in sorted order
+        self.game_file_stats = {}  # (mtime_ns, size) of each game file as of the last scan
         self.displayed_games = set()  # Track which games are currently displayed
-        self.game_state_hashes = {}  # Track game state hash to avoid redundant updates
+        self.game_state_stat = {}  # Track (mtime_ns, size) of each game file to avoid redundant updates
         self.game_last_seen = {}  # Track when each game was last seen
+        self.metadata_cache = {}  # game_id -> (mtime_ns, metadata) of its metadata file
+        self.observer = None  # Watchdog observer, when file watching is available
+        self.board_image_keys = {}  # Render cache key each game's board should be showing
+        self.pending_renders = {}  # Render cache key -> future of a render in progress
+        # (board FEN, last move) -> PhotoImage, oldest first. Shared by every game,
+        # so each distinct position is only rendered once. Keyed by piece placement
+        # only, since the move clocks and turn aren't drawn. The images belong to
+        # this monitor's Tk root, so the cache does too.
+        self.render_cache = OrderedDict()
+        # Game files changed since the last flush, shared with the monitoring thread
+        self.dirty_lock = threading.Lock()
+        self.dirty_files = {}  # Game file -> time.monotonic() of its first and latest change
+        self.finished_renders = []  # (game_id, key, future) of renders done since the last flush
+        self.flush_pending = False
+        # Render in separate processes so it never competes with Tk for the GIL.
+        # Spawn them rather than forking this threaded Tk app.
+        self.render_pool = ProcessPoolExecutor(
+            max_workers=min(4, os.cpu_count() or 1),
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        self.disk_cache_dir = self.open_disk_cache()
+        self.renders_since_prune = 0  # Renders installed since the disk cache was last trimmed
         
         # Create the main window
         self.root = tk.Tk()
@@ -63,6 +351,9 @@ class ChessBoardMonitor:
                                    bd=1, relief=tk.SUNKEN, anchor=tk.W)
         self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
         
+        # Set before any renders are submitted, their callbacks check it
+        self.running = True
+        
         # Find all game files
         self.find_game_files()
         
@@ -73,42 +364,119 @@ class ChessBoardMonitor:
         self.load_initial_boards()
         
         # Start the monitoring thread
-        self.running = True
         self.thread = threading.Thread(target=self.monitor_files)
         self.thread.daemon = True
         self.thread.start()
     
-    def compute_game_state_hash(self, file_path):
-        """Calculate MD5 hash of file contents"""
+    def open_disk_cache(self):
+        """
+        Set up the on-disk render cache, trimming it in the background.
+        
+        Returns:
+            str: The cache directory, or None if it can't be used
+        """
         try:
-            with open(file_path, 'rb') as f:
-                return hashlib.md5(f.read()).hexdigest()
-        except Exception as e:
-            logger.error(f"Error calculating hash: {e}")
+            os.makedirs(RENDER_DISK_CACHE, exist_ok=True)
+        except OSError as e:
+            logger.warning(f"Render disk cache unavailable: {e}")
+            return None
+        self.render_pool.submit(prune_disk_cache, RENDER_DISK_CACHE)
+        return RENDER_DISK_CACHE
+    
+    def get_file_stat(self, file_path):
+        """Get the (mtime_ns, size) of a file, used to tell when it has changed"""
+        try:
+            st = os.stat(file_path)
+        except OSError as e:
+            logger.error(f"Error checking {file_path}: {e}")
             return None
+        return (st.st_mtime_ns, st.st_size)
+    
+    def read_metadata(self, game_id):
+        """Read a game's metadata file, only parsing it again when its mtime changes"""
+        metadata_file = f"chess_autosaves/metadata_game_id_{game_id}.json"
+        try:
+            mtime = os.stat(metadata_file).st_mtime_ns
+        except OSError:
+            self.metadata_cache.pop(game_id, None)
+            return {}
+        
+        cached = self.metadata_cache.get(game_id)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        
+        try:
+            with open(metadata_file, 'rb') as f:
+                metadata = json_loads(f.read())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        
+        self.metadata_cache[game_id] = (mtime, metadata)
+        return metadata
+    
+    def iter_game_files(self):
+        """
+        Yield game files matching the pattern, one directory entry at a time.
+        
+        Yields:
+            tuple: (path, (mtime_ns, size)) for each matching file
+        """
+        if self.games_dir is None:
+            for path in glob.iglob(self.games_pattern):
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    # Removed since it was listed
+                    continue
+                if stat.S_ISREG(st.st_mode):
+                    yield path, (st.st_mtime_ns, st.st_size)
+            return
+        
+        try:
+            with os.scandir(self.games_dir) as entries:
+                for entry in entries:
+                    if self.game_name_re.match(entry.name) and entry.is_file():
+                        st = entry.stat()
+                        yield entry.path, (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            # No games have been saved yet
+            return
     
     def find_game_files(self):
-        """Find all game files matching the pattern."""
+        """Find all game files matching the pattern, recording their (mtime_ns, size)."""
         try:
-            previous_files = set(self.game_files)
-            self.game_files = glob.glob(self.games_pattern)
-            current_files = set(self.game_files)
+            previous_files = self.game_files
+            
+            # One directory scan gives both the matching files and their stats
+            self.game_file_stats = game_file_stats = dict(self.iter_game_files())
+            self.game_files = set(game_file_stats)
             
             # Log new files
-            new_files = current_files - previous_files
+            new_files = self.game_files - previous_files
             if new_files:
                 logger.info(f"Found {len(new_files)} new game files: {new_files}")
             
-            # Initialize last_modified tracker for each file
-            for file in self.game_files:
-                if file not in self.last_modified:
-                    self.last_modified[file] = None
-                    game_id = os.path.basename(file).replace('.json', '')
-                    # Initialize last seen time
-                    self.game_last_seen[game_id] = time.time()
+            if self.game_files != previous_files:
+                self.update_game_indexes()
+            
+            # Initialize last seen time for each new file
+            for file in new_files:
+                self.game_last_seen[self.get_game_id(file)] = time.time()
         except Exception as e:
             logger.error(f"Error finding game files: {str(e)}")
     
+    def get_game_id(self, game_file):
+        """Get the game ID for a game file, from its name the first time it's seen."""
+        game_id = self.file_game_ids.get(game_file)
+        if game_id is None:
+            game_id = os.path.basename(game_file).replace('.json', '').replace('game_id_', '')
+            self.file_game_ids[game_file] = game_id
+        return game_id
+    
+    def update_game_indexes(self):
+        """Recompute each game file's grid index after files are added or removed."""
+        self.game_indexes = {game_file: i for i, game_file in enumerate(sorted(self.game_files))}
+    
     def setup_grid_layout(self):
         """Setup the grid layout for the boards."""
         # Configure grid weights for responsive layout
@@ -129,7 +497,7 @@ class ChessBoardMonitor:
             cols = min(3, num_games)  # Max 3 columns
             
             # Create boards
-            for i, game_file in enumerate(sorted(self.game_files)):
+            for game_file, i in self.game_indexes.items():
                 self.create_or_update_game_display(game_file, i, cols)
                 
             self.status_var.set(f"Loaded {num_games} chess games at {datetime.now().strftime('%H:%M:%S')}")
@@ -143,182 +511,259 @@ class ChessBoardMonitor:
         """Create or update a single game display."""
         try:
             # Get game ID from filename
-            game_id = os.path.basename(game_file).replace('.json', '').replace('game_id_', '')
+            game_id = self.get_game_id(game_file)
             
             # Update last seen time
             self.game_last_seen[game_id] = time.time()
             
-            # Calculate current hash
-            current_hash = self.compute_game_state_hash(game_file)
-            if current_hash is None:
+            # A stat is enough to tell whether the file was rewritten
+            current_stat = self.get_file_stat(game_file)
+            if current_stat is None:
                 return
             
             # Skip update if the state hasn't changed
-            if game_id in self.game_state_hashes and self.game_state_hashes[game_id] == current_hash:
+            if self.game_state_stat.get(game_id) == current_stat:
                 logger.debug(f"No state change for {game_id}, skipping update")
                 return
             
-            # Update the state hash
-            self.game_state_hashes[game_id] = current_hash
+            # Update the stored stat
+            self.game_state_stat[game_id] = current_stat
             
-            # Try to read the game file
-            try:
-                with open(game_file, 'r') as f:
-                    file_content = f.read()
-                    if not file_content.strip():
-                        logger.warning(f"Empty file: {game_file}")
-                        return
-                    game_data = json.loads(file_content)
-            except (json.JSONDecodeError, FileNotFoundError, PermissionError) as e:
-                logger.warning(f"Error reading {game_file}: {str(e)}")
+            game_state = self.parse_game_file(game_file)
+            if game_state is None:
                 return
             
-            # Extract game info
-            fen = game_data.get("fen", chess.STARTING_FEN)
-            strategy = game_data.get("strategy_name", "Unknown")
-            last_updated = game_data.get("last_updated", datetime.now().isoformat())
-            move_history = game_data.get("move_history", [])
-
-            # Read instance_id from metadata file
-            metadata_file = f"chess_autosaves/metadata_game_id_{game_id}.json"
-            instance_id = "Unknown"
-            try:
-                with open(metadata_file, 'r') as f:
-                    metadata = json.load(f)
-                    instance_id = metadata.get("instance_id", "Unknown")
-            except (FileNotFoundError, json.JSONDecodeError) as e:
-                instance_id = "Unknown"
-            
-            # Calculate grid position
-            row, col = index // cols, index % cols
-            
             # Check if this game is already displayed
             if game_id in self.displayed_games:
-                # Update existing board
-                self.boards[game_id] = chess.Board(fen)
-                self.game_info[game_id] = {
-                    "file": game_file,
-                    "strategy": strategy,
-                    "last_updated": last_updated,
-                    "move_history": move_history,
-                    "instance_id": instance_id
-                }
-                
-                # Update labels with new info
-                game_frame = self.game_frames[game_id]
-                
-                # Update move count and last move time
-                for widget in game_frame.winfo_children():
-                    if isinstance(widget, tk.Frame):  # This is the header frame
-                        for label in widget.winfo_children():
-                            if isinstance(label, tk.Label) and "Moves:" in label.cget("text"):
-                                label.config(text=f"Moves: {len(move_history)}")
-                            elif isinstance(label, tk.Label) and "Last move:" in label.cget("text"):
-                                last_time = last_updated.split('T')[1].split('.')[0] if 'T' in last_updated else last_updated
-                                label.config(text=f"Last move: {last_time}")
-                
-                # Update the board display
-                self.update_board_display(game_id)
-                logger.info(f"Updated existing game {game_id}")
+                self.update_game_display(game_id, game_state)
             else:
-                # Create a new frame for the game
-                game_frame = tk.Frame(self.frame)
-                game_frame.grid(row=row, column=col, padx=5, pady=5, sticky="nsew")
-                self.game_frames[game_id] = game_frame
-                
-                # Create board object
-                board = chess.Board(fen)
-                self.boards[game_id] = board
-                self.game_info[game_id] = {
-                    "file": game_file,
-                    "strategy": strategy,
-                    "last_updated": last_updated,
-                    "move_history": move_history,
-                    "instance_id": instance_id
-                }
-                
-                # Create header with game info
-                header_frame = tk.Frame(game_frame)
-                header_frame.pack(fill=tk.X)
-                
-                # Game ID as title
-                title = os.path.basename(game_file).replace('.json', '')
-                game_title = tk.Label(header_frame, text=f"Game: {title}", font=("Arial", 12, "bold"))
-                game_title.pack(side=tk.TOP)
-                
-                # Strategy info
-                strategy_label = tk.Label(header_frame, text=f"Strategy: {strategy}")
-                strategy_label.pack(side=tk.TOP)
-
-                # Instance ID
-                instance_label = tk.Label(header_frame, text=f"Instance: {instance_id}")
-                instance_label.pack(side=tk.TOP)
-
-                # Move count
-                moves_label = tk.Label(header_frame, text=f"Moves: {len(move_history)}")
-                moves_label.pack(side=tk.TOP)
-                
-                # Last updated time
-                last_time = last_updated.split('T')[1].split('.')[0] if 'T' in last_updated else last_updated
-                updated_label = tk.Label(header_frame, text=f"Last move: {last_time}")
-                updated_label.pack(side=tk.TOP)
-                
-                # Label for chess board image
-                board_label = tk.Label(game_frame)
-                board_label.pack(padx=5, pady=5)
-                self.board_widgets[game_id] = board_label
-                
-                # Update display
-                self.update_board_display(game_id)
-                
-                # Mark as displayed
-                self.displayed_games.add(game_id)
-                logger.info(f"Created new game display for {game_id}")
+                self.create_game_display(game_id, game_state, index, cols)
                 
         except Exception as e:
             error_msg = f"Error creating/updating display for {game_file}: {str(e)}"
             logger.error(error_msg)
             print(error_msg)
     
+    def parse_game_file(self, game_file):
+        """
+        Read the parts of a game file that the display shows.
+        
+        Returns:
+            dict: The game's file, fen, strategy, last_updated, num_moves and
+                last_move, or None if the file couldn't be read
+        """
+        # Try to read the game file
+        try:
+            with open(game_file, 'rb') as f:
+                file_content = f.read()
+            if not file_content.strip():
+                logger.warning(f"Empty file: {game_file}")
+                return None
+            game_data = json_loads(file_content)
+        except (json.JSONDecodeError, FileNotFoundError, PermissionError) as e:
+            logger.warning(f"Error reading {game_file}: {str(e)}")
+            return None
+        
+        # Only the move count and last move are shown, so don't hold on to
+        # the whole history list between updates
+        move_history = game_data.get("move_history", [])
+        return {
+            "file": game_file,
+            "fen": game_data.get("fen", chess.STARTING_FEN),
+            "strategy": game_data.get("strategy_name", "Unknown"),
+            "last_updated": game_data.get("last_updated", datetime.now().isoformat()),
+            "num_moves": len(move_history),
+            "last_move": move_history[-1] if move_history else None
+        }
+    
+    def update_game_display(self, game_id, game_state):
+        """Update the labels and board of a game that is already displayed."""
+        previous_state = self.game_info[game_id]
+        # The instance doesn't change during a game, keep the one read at creation
+        game_state["instance_id"] = previous_state["instance_id"]
+        self.game_info[game_id] = game_state
+        
+        # Update last move time, only formatting it again when it changed
+        labels = self.game_labels[game_id]
+        if game_state["last_updated"] == previous_state["last_updated"]:
+            game_state["last_time"] = previous_state["last_time"]
+        else:
+            game_state["last_time"] = format_time(game_state["last_updated"])
+            labels["updated"].config(text=f"Last move: {game_state['last_time']}")
+        
+        # The file was rewritten without a move being made, nothing else to redraw
+        if game_state["fen"] == previous_state["fen"] and game_state["num_moves"] == previous_state["num_moves"]:
+            return
+        
+        # Update move count and board
+        self.board_fens[game_id] = board_fen(game_state["fen"])
+        labels["moves"].config(text=f"Moves: {game_state['num_moves']}")
+        
+        # Update the board display
+        self.update_board_display(game_id)
+        logger.info(f"Updated existing game {game_id}")
+    
+    def create_game_display(self, game_id, game_state, index, cols):
+        """Create the frame, labels and board for a newly found game."""
+        # Read instance_id from metadata file
+        instance_id = self.read_metadata(game_id).get("instance_id", "Unknown")
+        game_state["instance_id"] = instance_id
+        
+        # Calculate grid position
+        row, col = index // cols, index % cols
+        
+        # Create a new frame for the game
+        game_frame = tk.Frame(self.frame)
+        game_frame.grid(row=row, column=col, padx=5, pady=5, sticky="nsew")
+        self.game_frames[game_id] = game_frame
+        
+        # Store the position to draw
+        self.board_fens[game_id] = board_fen(game_state["fen"])
+        self.game_info[game_id] = game_state
+        
+        # Create header with game info
+        header_frame = tk.Frame(game_frame)
+        header_frame.pack(fill=tk.X)
+        
+        # Game ID as title
+        title = os.path.basename(game_state["file"]).replace('.json', '')
+        game_title = tk.Label(header_frame, text=f"Game: {title}", font=("Arial", 12, "bold"))
+        game_title.pack(side=tk.TOP)
+        
+        # Strategy info
+        strategy_label = tk.Label(header_frame, text=f"Strategy: {game_state['strategy']}")
+        strategy_label.pack(side=tk.TOP)
+
+        # Instance ID
+        instance_label = tk.Label(header_frame, text=f"Instance: {instance_id}")
+        instance_label.pack(side=tk.TOP)
+
+        # Move count
+        moves_label = tk.Label(header_frame, text=f"Moves: {game_state['num_moves']}")
+        moves_label.pack(side=tk.TOP)
+        
+        # Last updated time
+        game_state["last_time"] = format_time(game_state["last_updated"])
+        updated_label = tk.Label(header_frame, text=f"Last move: {game_state['last_time']}")
+        updated_label.pack(side=tk.TOP)
+        
+        # Keep the labels that change so updates don't have to search for them
+        self.game_labels[game_id] = {
+            "strategy": strategy_label,
+            "instance": instance_label,
+            "moves": moves_label,
+            "updated": updated_label
+        }
+        
+        # Label for chess board image
+        board_label = tk.Label(game_frame)
+        board_label.pack(padx=5, pady=5)
+        self.board_widgets[game_id] = board_label
+        
+        # Update display
+        self.update_board_display(game_id)
+        
+        # Mark as displayed
+        self.displayed_games.add(game_id)
+        logger.info(f"Created new game display for {game_id}")
+    
     def update_board_display(self, game_id):
         """Update the display for a specific board."""
-        if game_id not in self.boards or game_id not in self.board_widgets:
+        if game_id not in self.board_fens or game_id not in self.board_widgets:
             return
             
-        board = self.boards[game_id]
+        placement = self.board_fens[game_id]
         board_widget = self.board_widgets[game_id]
         
         try:
             # Set the lastmove argument to highlight the last move
             last_move = None
-            move_history = self.game_info[game_id].get("move_history", [])
-            if move_history:
+            last_move_str = self.game_info[game_id].get("last_move")
+            if last_move_str:
                 try:
-                    last_move_str = move_history[-1]
                     from_square = chess.parse_square(last_move_str[:2])
                     to_square = chess.parse_square(last_move_str[2:4])
                     last_move = chess.Move(from_square, to_square)
                 except (ValueError, IndexError) as e:
                     logger.warning(f"Could not parse last move for {game_id}: {str(e)}")
             
-            # Convert board to SVG - highlight the last move
-            svg_data = chess.svg.board(board, size=350, lastmove=last_move)
+            # Reuse the image if this position and last move were already rendered
+            key = (placement, last_move.uci() if last_move else None)
+            self.board_image_keys[game_id] = key
+            
+            # Already showing exactly this, don't make Tk repaint it
+            if getattr(board_widget, "image_key", None) == key:
+                return
             
-            # Convert SVG to PNG
-            png_data = svg2png(bytestring=svg_data)
+            photo = self.render_cache.get(key)
+            if photo is not None:
+                self.render_cache.move_to_end(key)
+                
+                # Update label
+                board_widget.configure(image=photo)
+                board_widget.image = photo  # Prevent garbage collection
+                board_widget.image_key = key
+                return
             
-            # Convert PNG to PhotoImage
-            image = Image.open(io.BytesIO(png_data))
-            photo = ImageTk.PhotoImage(image)
+            # Rasterize in the render processes, or load it from the disk cache
+            # there if an earlier run rendered it, so the UI doesn't block. Then hand
+            # the image back to the main thread, where Tk images have to be created
+            def on_rendered(future, gid=game_id, k=key):
+                if self.running:
+                    self.mark_rendered(gid, k, future)
             
-            # Update label
-            board_widget.configure(image=photo)
-            board_widget.image = photo  # Prevent garbage collection
+            # Games that reach a position while it's still rendering wait on
+            # the same render instead of starting their own
+            future = self.pending_renders.get(key)
+            if future is None:
+                future = self.render_pool.submit(load_or_render_board, *key, self.disk_cache_dir)
+                self.pending_renders[key] = future
+            future.add_done_callback(on_rendered)
         except Exception as e:
             error_msg = f"Error updating board display for {game_id}: {str(e)}"
             logger.error(error_msg)
             print(error_msg)
     
+    def install_board_image(self, game_id, key, future):
+        """Show a board image rendered on the render pool, on the main thread."""
+        self.pending_renders.pop(key, None)
+        try:
+            ppm_data = future.result()
+        except Exception as e:
+            error_msg = f"Error updating board display for {game_id}: {str(e)}"
+            logger.error(error_msg)
+            print(error_msg)
+            return
+        
+        photo = self.render_cache.get(key)
+        if photo is None:
+            photo = self.cache_board_image(key, ppm_data)
+            
+            # Trim the disk cache every so often, in the background
+            self.renders_since_prune += 1
+            if self.disk_cache_dir is not None and self.renders_since_prune >= DISK_CACHE_PRUNE_EVERY:
+                self.renders_since_prune = 0
+                self.render_pool.submit(prune_disk_cache, self.disk_cache_dir)
+        
+        # The game may have moved on or been removed while this was rendering
+        if self.board_image_keys.get(game_id) != key or game_id not in self.board_widgets:
+            return
+        
+        # Update label
+        board_widget = self.board_widgets[game_id]
+        board_widget.configure(image=photo)
+        board_widget.image = photo  # Prevent garbage collection
+        board_widget.image_key = key
+    
+    def cache_board_image(self, key, ppm_data):
+        """Create the Tk image for a rendered board and keep it in the render cache."""
+        # Tk decodes the PPM itself
+        photo = tk.PhotoImage(master=self.root, data=ppm_data, format="PPM")
+        self.render_cache[key] = photo
+        if len(self.render_cache) > RENDER_CACHE_SIZE:
+            self.render_cache.popitem(last=False)
+        return photo
+    
     def rearrange_boards(self):
         """Rearrange boards in the grid if needed."""
         # Get currently displayed games
@@ -340,11 +785,18 @@ class ChessBoardMonitor:
     
     def check_for_missing_games(self):
         """Check for game files that were previously displayed but are now missing."""
+        # Only games whose files are gone can have gone missing. game_indexes
+        # is replaced rather than changed in place, so it's safe to walk here.
+        live_ids = {self.get_game_id(game_file) for game_file in self.game_indexes}
+        missing_games = self.displayed_games - live_ids
+        if not missing_games:
+            return
+        
         current_time = time.time()
         games_to_remove = []
         
         # Find games that haven't been seen for a while
-        for game_id in list(self.displayed_games):
+        for game_id in missing_games:
             last_seen = self.game_last_seen.get(game_id, 0)
             time_since_last_seen = current_time - last_seen
             
@@ -362,55 +814,217 @@ class ChessBoardMonitor:
             if game_id in self.board_widgets:
                 del self.board_widgets[game_id]
                 
-            if game_id in self.boards:
-                del self.boards[game_id]
+            if game_id in self.game_labels:
+                del self.game_labels[game_id]
+                
+            if game_id in self.board_image_keys:
+                del self.board_image_keys[game_id]
+                
+            if game_id in self.board_fens:
+                del self.board_fens[game_id]
                 
             if game_id in self.game_info:
                 del self.game_info[game_id]
                 
-            if game_id in self.game_state_hashes:
-                del self.game_state_hashes[game_id]
+            if game_id in self.game_state_stat:
+                del self.game_state_stat[game_id]
                 
             self.displayed_games.remove(game_id)
             
         if games_to_remove:
             self.rearrange_boards()
     
+    def start_watcher(self):
+        """
+        Start watching the game directory for file events.
+        
+        Returns:
+            queue.Queue: Queue of (kind, path) events, or None if watchdog isn't
+                available or the directory can't be watched
+        """
+        if Observer is None or self.games_dir is None:
+            return None
+        
+        watch_dir = self.games_dir
+        events = queue.Queue()
+        handler = GameFileEventHandler(self.game_name_re, events)
+        try:
+            os.makedirs(watch_dir, exist_ok=True)
+            self.observer = Observer()
+            self.observer.schedule(handler, watch_dir, recursive=False)
+            self.observer.daemon = True
+            self.observer.start()
+        except Exception as e:
+            logger.warning(f"Could not watch {watch_dir}, falling back to polling: {str(e)}")
+            self.observer = None
+            return None
+        
+        logger.info(f"Watching {watch_dir} for game file changes")
+        return events
+    
+    def mark_dirty(self, game_files):
+        """
+        Queue game files for updating from the monitoring thread. A file is
+        applied once it has gone FILE_QUIET_MS without changing again, or at the
+        latest FILE_MAX_WAIT_MS after it first changed, and files that are ready
+        together are applied in one callback.
+        
+        Args:
+            game_files (iterable): Game files that changed, may be empty to just
+                run the missing games check
+        """
+        now = time.monotonic()
+        with self.dirty_lock:
+            for game_file in game_files:
+                first_changed = self.dirty_files.get(game_file, (now,))[0]
+                self.dirty_files[game_file] = (first_changed, now)
+        self._schedule_flush()
+    
+    def _schedule_flush(self):
+        """Schedule flush_dirty on the main thread unless it already is, from any thread."""
+        with self.dirty_lock:
+            if self.flush_pending:
+                return
+            self.flush_pending = True
+        try:
+            self.root.after(FLUSH_DELAY_MS, self.flush_dirty)
+        except (RuntimeError, tk.TclError) as e:
+            # Tk refuses while the window is closing; don't leave the flag set,
+            # or no later change would ever schedule a flush again
+            with self.dirty_lock:
+                self.flush_pending = False
+            if self.running:
+                logger.warning(f"Could not schedule a display update: {str(e)}")
+    
+    def mark_rendered(self, game_id, key, future):
+        """
+        Queue a finished render for installing, from the render pool's callback
+        thread. It's picked up by the same flush as queued file changes.
+        
+        Args:
+            game_id (str): Game the board was rendered for
+            key (tuple): Render cache key of the board
+            future (Future): The finished render
+        """
+        with self.dirty_lock:
+            self.finished_renders.append((game_id, key, future))
+        self._schedule_flush()
+    
+    def flush_dirty(self):
+        """Apply all queued updates on the main thread, so Tk redraws once for all of them."""
+        now = time.monotonic()
+        quiet_since = now - FILE_QUIET_MS / 1000
+        overdue_since = now - FILE_MAX_WAIT_MS / 1000
+        with self.dirty_lock:
+            # Leave files that are still being written for a later flush,
+            # unless they've waited too long already
+            dirty_files = [
+                f for f, (first_changed, changed) in self.dirty_files.items()
+                if changed <= quiet_since or first_changed <= overdue_since
+            ]
+            for game_file in dirty_files:
+                del self.dirty_files[game_file]
+            finished_renders = self.finished_renders
+            self.finished_renders = []
+            self.flush_pending = False
+            reschedule = bool(self.dirty_files)
+        if reschedule:
+            self._schedule_flush()
+        
+        game_indexes = self.game_indexes
+        cols = min(3, len(game_indexes))
+        updated = 0
+        for game_file in dirty_files:
+            index = game_indexes.get(game_file)
+            if index is not None:
+                self.create_or_update_game_display(game_file, index, cols)
+                updated += 1
+        
+        # Install renders after the updates, so ones they superseded aren't shown
+        for game_id, key, future in finished_renders:
+            self.install_board_image(game_id, key, future)
+        
+        # Check for missing games every cycle
+        self.check_for_missing_games()
+        
+        if updated:
+            self.status_var.set(f"Updated {updated} game(s) at {datetime.now().strftime('%H:%M:%S')}")
+    
     def monitor_files(self):
         """Monitor all game files for changes and look for new files."""
+        events = self.start_watcher()
+        if events is None:
+            self.poll_files()
+            return
+        
+        while self.running:
+            try:
+                # Block until something changes, waking up every refresh_rate
+                # seconds to keep present games alive and expire missing ones
+                changed = set()
+                files_changed = False
+                try:
+                    kind, game_file = events.get(timeout=self.refresh_rate)
+                    while True:
+                        if kind == 'deleted':
+                            changed.discard(game_file)
+                            if game_file in self.game_files:
+                                self.game_files.remove(game_file)
+                                files_changed = True
+                        else:
+                            changed.add(game_file)
+                            if game_file not in self.game_files:
+                                self.game_files.add(game_file)
+                                files_changed = True
+                                logger.info(f"Found new game file: {game_file}")
+                        kind, game_file = events.get_nowait()
+                except queue.Empty:
+                    pass
+                
+                # The grid only needs laying out again when games come or go
+                if files_changed:
+                    self.update_game_indexes()
+                
+                # Games whose files still exist count as seen
+                now = time.time()
+                for game_file in self.game_files:
+                    game_id = self.get_game_id(game_file)
+                    self.game_last_seen[game_id] = now
+                
+                self.mark_dirty(changed)
+                
+            except Exception as e:
+                error_msg = f"Error monitoring files: {str(e)}"
+                logger.error(error_msg)
+                self.status_var.set(error_msg)
+                time.sleep(self.refresh_rate)
+    
+    def poll_files(self):
+        """Poll all game files for changes, for when file events aren't available."""
         while self.running:
             try:
                 # Check for new game files
                 self.find_game_files()
                 
-                # Check each file for content changes (not just modification time)
-                game_files_sorted = sorted(self.game_files)
-                for i, game_file in enumerate(game_files_sorted):
-                    if os.path.exists(game_file):
+                # Check each file for changes
+                changed = []
+                for game_file in list(self.game_indexes):
+                    # The scan already stat'ed every file that exists
+                    current_stat = self.game_file_stats.get(game_file)
+                    if current_stat is not None:
                         try:
-                            # Get current hash
-                            current_hash = self.compute_game_state_hash(game_file)
-                            if current_hash is None:
-                                continue
-                                
-                            # Get game ID
-                            game_id = os.path.basename(game_file).replace('.json', '')
+                            # Get game ID, the file still exists so the game counts as seen
+                            game_id = self.get_game_id(game_file)
+                            self.game_last_seen[game_id] = time.time()
                             
-                            # Check if content has changed
-                            if game_id not in self.game_state_hashes or self.game_state_hashes[game_id] != current_hash:
+                            # Check if the file has been rewritten
+                            if self.game_state_stat.get(game_id) != current_stat:
                                 # Content has changed, update display
-                                cols = min(3, len(game_files_sorted))
-                                
-                                # Schedule update on main thread
-                                def update_game(gf=game_file, idx=i, c=cols):
-                                    self.create_or_update_game_display(gf, idx, c)
-                                    
-                                self.root.after(0, update_game)
+                                changed.append(game_file)
                         except Exception as e:
                             logger.error(f"Error processing file {game_file}: {str(e)}")
                 
-                # Check for missing games every cycle
-                self.root.after(0, self.check_for_missing_games)
+                self.mark_dirty(changed)
                 
                 # Sleep between checks
                 time.sleep(self.refresh_rate)
@@ -424,6 +1038,10 @@ class ChessBoardMonitor:
     def on_close(self):
         """Handle window close event."""
         self.running = False
+        if self.observer is not None:
+            self.observer.stop()
+        self.render_pool.shutdown(wait=False, cancel_futures=True)
+        self.render_cache.clear()
         self.root.destroy()
     
     def run(self):
@@ -436,7 +1054,7 @@ def main():
     
     parser = argparse.ArgumentParser(description='Chess Games Monitor')
     parser.add_argument('--games', type=str, default='chess_autosaves/game_id_*.json',
-                        help='Pattern to match game files (supports wildcards)')
+                        help='Pattern to match game files (supports wildcards, also in directory names)')
     parser.add_argument('--refresh', type=float, default=1.0,
                         help='Refresh rate in seconds')
     parser.add_argument('--timeout', type=float, default=20.0,
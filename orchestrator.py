@@ -1,96 +1,160 @@
 import time
+import chess
 from morphcloud.api import MorphCloudClient, Instance, Snapshot, ApiError
 import argparse
 import asyncio
+import contextlib
 import os
 import json
-import shutil
 import logging
-import hashlib
+import shlex
+import socket
+import io
+import tarfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Optional, Union
 
 
-async def play_chess(client, instance_id, game_id, moves, strategy):
-    instance = client.instances.get(instance_id)
+# Project files the agent needs on each instance
+APP_FILES = [
+    "config.yaml",
+    "pyproject.toml",
+    "requirements.txt",
+    "schemas.py",
+    "chess_game.py",
+    "chess_engine.py",
+    "agent.py",
+]
+
+
+async def play_chess(instance, game_id, moves, strategy):
     #TODO: update for other model providers/actually use config.yaml for orchestration
-    run_agent_cmd = f"export OPENAI_API_KEY={os.environ.get('OPENAI_API_KEY')} && cd app && mkdir chess_autosaves && uv add pyproject.toml && uv run agent.py --game-id {game_id} --moves {moves} --strategy {strategy}"
+    # The API key comes from app/.env, written once when the base instance was set up
+    run_agent_cmd = f"cd app && if [ -f .env ]; then set -a && . ./.env && set +a; fi && mkdir chess_autosaves && uv add pyproject.toml && uv run agent.py --game-id {game_id} --moves {moves} --strategy {strategy}"
     await instance.aexec(command=run_agent_cmd)
 
 
-async def sync_gamestate(client, instance_id, game_id, timeout=60, game_timeout=20):
+def set_tcp_nodelay(ssh) -> None:
+    """
+    Turn off Nagle's algorithm on an SSH connection's socket. Syncing sends
+    lots of small requests that would otherwise be held back waiting on ACKs.
+    
+    Args:
+        ssh: Open SSH connection to an instance
+    """
+    sock = ssh._client.get_transport().sock
+    if isinstance(sock, socket.socket):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+
+def remote_md5(ssh_client, remote_file):
+    """
+    Hash a file on the instance, so it only has to be downloaded when it changed.
+    
+    Args:
+        ssh_client: Open paramiko SSHClient of the instance
+        remote_file (str): Path of the file on the instance
+    
+    Returns:
+        str: The file's md5 hex digest, or None if it doesn't exist
+    """
+    _, stdout, _ = ssh_client.exec_command(f"md5sum {shlex.quote(remote_file)}")
+    output = stdout.read()
+    if stdout.channel.recv_exit_status() != 0:
+        return None
+    return output.split(maxsplit=1)[0].decode()
+
+
+async def sync_gamestate(ssh, game_id, timeout=60, game_timeout=20, idle_timeout=8):
     """
     Asynchronously synchronize chess game state from a MorphCloud instance
-    to local files. Uses hash-based change detection to avoid unnecessary updates.
+    to local files. The file is hashed on the instance and only downloaded
+    when that hash changes.
+    
+    Args:
+        ssh: Open SSH connection to the game's instance, used for the whole sync
+        game_id: Game ID to synchronize
+        timeout (int): How long to continue synchronizing in seconds
+        game_timeout (int): How long a game can be missing before considered inactive
+        idle_timeout (int): How long the game can go without changing before
+            synchronization stops, in seconds. Polling backs off while the game
+            is idle, so this is a time budget rather than a number of polls.
     """
     os.makedirs("tmp", exist_ok=True)
     os.makedirs("chess_autosaves", exist_ok=True)
-    instance = client.instances.get(instance_id)
     last_content_hash = None
     last_activity_time = time.time()
+    last_change_time = time.monotonic()
     consecutive_unchanged = 0
-    max_unchanged = 15
-    def calculate_hash_sync(file_path):
-        try:
-            with open(file_path, "rb") as f:
-                return hashlib.md5(f.read()).hexdigest()
-        except Exception as e:
-            logger.error(f"Error calculating hash: {e}")
-            return None
-    async def calculate_hash(file_path):
-        return await asyncio.to_thread(calculate_hash_sync, file_path)
-    ssh_ = await asyncio.to_thread(instance.ssh)
-    with ssh_ as ssh:
-        sftp = ssh._client.open_sftp()
-        try:
-            start_time = time.time()
-            end_time = start_time + timeout
-            temp_file = f"tmp/game_id_{game_id}_tmp.json"
-            target_file = f"chess_autosaves/game_id_{game_id}.json"
-            remote_file = f"app/chess_autosaves/game_id_{game_id}.json"
-            logger.info(f"Starting synchronization for game {game_id}")
-            while time.time() < end_time and consecutive_unchanged <= max_unchanged:
-                try:
-                    # Run blocking SFTP call in a thread
-                    await asyncio.to_thread(sftp.get, remote_file, temp_file)
+    idle = False
+    sftp = ssh._client.open_sftp()
+    try:
+        start_time = time.time()
+        end_time = start_time + timeout
+        temp_file = f"tmp/game_id_{game_id}_tmp.json"
+        target_file = f"chess_autosaves/game_id_{game_id}.json"
+        remote_file = f"app/chess_autosaves/game_id_{game_id}.json"
+        logger.info(f"Starting synchronization for game {game_id}")
+        while time.time() < end_time:
+            poll_start = time.monotonic()
+            poll_interval = 0.5
+            # Run blocking SSH call in a thread
+            current_hash = await asyncio.to_thread(remote_md5, ssh._client, remote_file)
+            if current_hash is None:
+                logger.warning(f"Remote file not found for game {game_id}")
+                time_since_activity = time.time() - last_activity_time
+                if time_since_activity > game_timeout:
+                    logger.info(
+                        f"Game {game_id} inactive (no updates for {time_since_activity:.1f}s)"
+                    )
+                    break
+            else:
+                last_activity_time = time.time()
+                if current_hash != last_content_hash:
                     try:
-                        # Run blocking JSON load in a thread
-                        game_state = await asyncio.to_thread(
-                            lambda: json.load(open(temp_file))
-                        )
-                        #TODO: just check FEN string for changes instead of whole file hash?
-                        current_hash = await calculate_hash(temp_file)
-                        last_activity_time = time.time()
-                        if current_hash != last_content_hash:
-                            logger.info(f"Game state changed for game {game_id}")
-                            last_content_hash = current_hash
-                            consecutive_unchanged = 0
-                            # Atomic move
-                            await asyncio.to_thread(shutil.move, temp_file, target_file)
-                        else:
-                            consecutive_unchanged += 1
+                        # Run blocking SFTP call in a thread
+                        await asyncio.to_thread(sftp.get, remote_file, temp_file)
+                        # Check it's valid JSON, reading it in a thread
+                        data = await asyncio.to_thread(Path(temp_file).read_bytes)
+                        game_state = json.loads(data)
+                        logger.info(f"Game state changed for game {game_id}")
+                        last_content_hash = current_hash
+                        last_change_time = time.monotonic()
+                        consecutive_unchanged = 0
+                        poll_interval = 0.1
+                        # Atomic rename, tmp/ and chess_autosaves/ are on the same filesystem
+                        os.replace(temp_file, target_file)
+                        # Nothing more will change once the game has ended
+                        if chess.Board(game_state.get("fen", chess.STARTING_FEN)).is_game_over():
+                            logger.info(f"Game {game_id} is over")
+                            break
+                    except FileNotFoundError:
+                        # Removed between hashing and downloading
+                        logger.warning(f"Remote file not found for game {game_id}")
                     except json.JSONDecodeError:
                         logger.warning(
                             f"Invalid JSON in downloaded file for game {game_id}"
                         )
                         consecutive_unchanged += 1
-                except FileNotFoundError:
-                    logger.warning(f"Remote file not found for game {game_id}")
-                    time_since_activity = time.time() - last_activity_time
-                    if time_since_activity > game_timeout:
-                        logger.info(
-                            f"Game {game_id} inactive (no updates for {time_since_activity:.1f}s)"
-                        )
-                        break
-                await asyncio.sleep(0.5)
-            logger.info(
-                f"Sync complete for game {game_id}: "
-                f"timeout={time.time() >= end_time}, "
-                f"unchanged_limit={consecutive_unchanged > max_unchanged}"
-            )
-        except Exception as e:
-            logger.error(f"Error during synchronization: {e}")
-        finally:
-            sftp.close()
+                else:
+                    consecutive_unchanged += 1
+                    poll_interval = min(2.0, 0.25 * 2 ** min(consecutive_unchanged - 1, 3))
+                idle = time.monotonic() - last_change_time > idle_timeout
+                if idle:
+                    break
+            # Poll quickly right after a move, backing off while the agent thinks.
+            # The poll itself counts towards the interval.
+            await asyncio.sleep(max(0, poll_interval - (time.monotonic() - poll_start)))
+        logger.info(
+            f"Sync complete for game {game_id}: "
+            f"timeout={time.time() >= end_time}, "
+            f"idle={idle}"
+        )
+    except Exception as e:
+        logger.error(f"Error during synchronization: {e}")
+    finally:
+        sftp.close()
 
 
 def setup_snapshot(client: MorphCloudClient, snapshot_id: Optional[Union[str, int]], vcpus=1, memory=4096, disk_size=8192) -> Snapshot:
@@ -106,11 +170,12 @@ def setup_snapshot(client: MorphCloudClient, snapshot_id: Optional[Union[str, in
             memory=4096,
             disk_size=8192
         )
-    snapshot = (
-        snapshot.setup("apt update -y")
-        .setup("apt-get install -y python3-pip")
-        .setup("curl -LsSf https://astral.sh/uv/install.sh | bash")
-        .setup("mkdir app")
+    # One setup step, so it's a single command and a single snapshot
+    snapshot = snapshot.setup(
+        "apt update -y"
+        " && apt-get install -y python3-pip"
+        " && curl -LsSf https://astral.sh/uv/install.sh | bash"
+        " && mkdir -p app"
     )
     return snapshot
 
@@ -118,19 +183,46 @@ def setup_snapshot(client: MorphCloudClient, snapshot_id: Optional[Union[str, in
 def setup_base_instance(client: MorphCloudClient, snapshot: Snapshot) -> Instance:
     instance = client.instances.start(snapshot_id=snapshot.id, ttl_seconds=3600, ttl_action="stop")
     cwd = os.getcwd()
-    # upload project to base instance
+    # upload project to base instance, as one tar so it's a single transfer
+    bundle = io.BytesIO()
+    with tarfile.open(fileobj=bundle, mode="w") as tar:
+        for name in APP_FILES:
+            tar.add(os.path.join(cwd, name), arcname=name)
+        # Keep the API key in a private file on the instance, so clones inherit it
+        # and it never shows up on a command line
+        api_key = os.environ.get("OPENAI_API_KEY")
+        if api_key:
+            env_data = f"OPENAI_API_KEY={shlex.quote(api_key)}\n".encode()
+            env_info = tarfile.TarInfo(".env")
+            env_info.size = len(env_data)
+            env_info.mode = 0o600
+            tar.addfile(env_info, io.BytesIO(env_data))
     with instance.ssh() as ssh:
-        sftp = ssh._client.open_sftp()
-        sftp.put(os.path.join(cwd, "config.yaml"), "app/config.yaml")
-        sftp.put(os.path.join(cwd, "pyproject.toml"), "app/pyproject.toml")
-        sftp.put(os.path.join(cwd, "requirements.txt"), "app/requirements.txt")
-        sftp.put(os.path.join(cwd, "schemas.py"), "app/schemas.py")
-        sftp.put(os.path.join(cwd, "chess_game.py"), "app/chess_game.py")
-        sftp.put(os.path.join(cwd, "chess_engine.py"), "app/chess_engine.py")
-        sftp.put(os.path.join(cwd, "agent.py"), "app/agent.py")
+        # Stream it straight into tar on the instance, no file to upload and clean up
+        stdin, stdout, stderr = ssh._client.exec_command("mkdir -p app && tar xf - -C app")
+        stdin.write(bundle.getvalue())
+        stdin.channel.shutdown_write()
+        if stdout.channel.recv_exit_status() != 0:
+            raise RuntimeError(f"Failed to upload project: {stderr.read().decode()}")
     return instance
 
 
+def stop_instance(instance: Instance) -> None:
+    try:
+        instance.stop()
+        logger.info(f"Stopped instance {instance.id}")
+    except ApiError as e:
+        logger.error(f"Failed to stop instance {instance.id}: {e}")
+
+
+def delete_snapshot(snapshot: Snapshot) -> None:
+    try:
+        snapshot.delete()
+        logger.info(f"Deleted snapshot {snapshot.id}")
+    except ApiError as e:
+        logger.error(f"Failed to delete snapshot {snapshot.id}: {e}")
+
+
 async def main(*args, **kwargs):
     client = MorphCloudClient()
     snapshot_id = kwargs.get("snapshot_id", None)
@@ -163,11 +255,29 @@ async def main(*args, **kwargs):
             json.dump(metadata, f, indent=4)
     # TODO: assert lengths
     play_chess_tasks = list(zip(clones, game_ids, strategies))
-    sync_gamestate_tasks = list(zip(clones, game_ids))
-    await asyncio.gather(
-        *[play_chess(client, c.id, g, NUM_MOVES, s) for c, g, s in play_chess_tasks],
-        *[sync_gamestate(client, c.id, g) for c, g in sync_gamestate_tasks],
+    # Every game keeps a blocking SSH call in flight while it syncs, so make sure
+    # the default executor has room for all of them on top of its usual size
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=max(min(32, (os.cpu_count() or 1) + 4), 2 * len(clones)))
     )
+    # Connect to all clones at once, and keep each connection for its whole game
+    with contextlib.ExitStack() as stack:
+        async def connect(clone):
+            # Registered as soon as it's open, so it's closed even if another fails
+            ssh = stack.enter_context(await asyncio.to_thread(clone.ssh))
+            set_tcp_nodelay(ssh)
+            return ssh
+        # Wait for every attempt to finish before giving up on a failed one,
+        # so none is still connecting once the stack has been closed
+        ssh_conns = await asyncio.gather(*[connect(c) for c in clones], return_exceptions=True)
+        for result in ssh_conns:
+            if isinstance(result, BaseException):
+                raise result
+        sync_gamestate_tasks = list(zip(ssh_conns, game_ids))
+        await asyncio.gather(
+            *[play_chess(c, g, NUM_MOVES, s) for c, g, s in play_chess_tasks],
+            *[sync_gamestate(ssh, g) for ssh, g in sync_gamestate_tasks],
+        )
 
 
 if __name__ == "__main__":
@@ -195,18 +305,13 @@ if __name__ == "__main__":
     if not args.persist_instances:
         client = MorphCloudClient()
         instances = client.instances.list()
-        for instance in instances:
-            try:
-                instance.stop()
-                logger.info(f"Stopped instance {instance.id}")
-            except ApiError as e:
-                logger.error(f"Failed to stop instance {instance.id}: {e}")
+        # Each stop is an independent API call, so overlap them
+        if instances:
+            with ThreadPoolExecutor(max_workers=min(32, len(instances))) as executor:
+                list(executor.map(stop_instance, instances))
     if not args.persist_snapshots:
         snapshots = client.snapshots.list()
-        for snapshot in snapshots:
-            try:
-                snapshot.delete()
-                logger.info(f"Deleted snapshot {snapshot.id}")
-            except ApiError as e:
-                logger.error(f"Failed to delete snapshot {snapshot.id}: {e}")
+        if snapshots:
+            with ThreadPoolExecutor(max_workers=min(16, len(snapshots))) as executor:
+                list(executor.map(delete_snapshot, snapshots))
 
@@ -1,22 +1,26 @@
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, field_validator
 from typing import List, Optional
 
 class ChessMoveResponse(BaseModel):
     """Structured response from LLM for chess move selection."""
+    model_config = ConfigDict(frozen=True)
+
     selected_move: str = Field(..., description="The primary move selected by the LLM in UCI format (e.g., 'e2e4')")
     alternative_moves: List[str] = Field(default_factory=list, description="Alternative moves the LLM considered")
     reasoning: Optional[str] = Field(None, description="Reasoning behind the move selection")
 
-    @validator('selected_move')
+    @field_validator('selected_move')
+    @classmethod
     def validate_selected_move(cls, v):
         # Basic UCI format validation (could be expanded)
         if not (len(v) == 4 or len(v) == 5):  # e2e4 or e7e8q for promotion
             raise ValueError(f"Invalid UCI move format: {v}")
         return v
 
-    @validator('alternative_moves')
-    def validate_alternative_moves(cls, v, values):
+    @field_validator('alternative_moves')
+    @classmethod
+    def validate_alternative_moves(cls, v, info: ValidationInfo):
         # Ensure alternatives don't include the selected move
-        if 'selected_move' in values and values['selected_move'] in v:
-            v.remove(values['selected_move'])
+        if 'selected_move' in info.data and info.data['selected_move'] in v:
+            v.remove(info.data['selected_move'])
         return v
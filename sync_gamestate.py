@@ -2,7 +2,6 @@ from morphcloud.api import MorphCloudClient
 import argparse
 import time
 import json
-import shutil
 import os
 import logging
 import hashlib
@@ -40,15 +39,6 @@ def sync_game_state(instance_id, game_id, timeout=60, game_timeout=20):
     consecutive_unchanged = 0
     max_unchanged = 15  # Stop after 15 unchanged checks
     
-    def calculate_hash(file_path):
-        """Calculate MD5 hash of file contents"""
-        try:
-            with open(file_path, 'rb') as f:
-                return hashlib.md5(f.read()).hexdigest()
-        except Exception as e:
-            logger.error(f"Error calculating hash: {e}")
-            return None
-    
     with instance.ssh() as ssh:
         sftp = ssh._client.open_sftp()
         try:
@@ -69,25 +59,30 @@ def sync_game_state(instance_id, game_id, timeout=60, game_timeout=20):
                     
                     # Verify if the file is valid JSON and has changed
                     try:
-                        # Check if valid JSON
-                        game_state = json.load(open(temp_file))
+                        # Read the file once, for both the hash and the JSON check
+                        with open(temp_file, 'rb') as f:
+                            data = f.read()
                         
                         # Get content hash
-                        current_hash = calculate_hash(temp_file)
-                        
-                        # Update last activity time
-                        last_activity_time = time.time()
+                        current_hash = hashlib.blake2b(data, digest_size=16).hexdigest()
                         
                         # Only update if content has changed
                         if current_hash != last_content_hash:
+                            # Check if valid JSON, unchanged content was already checked
+                            json.loads(data)
+                            
+                            # Update last activity time
+                            last_activity_time = time.time()
+                            
                             logger.info(f"Game state changed for game {game_id}")
                             last_content_hash = current_hash
                             consecutive_unchanged = 0
                             
                             # Move atomically to avoid partial reads by the monitor
-                            shutil.move(temp_file, target_file)
+                            os.replace(temp_file, target_file)
                             print(f"Updated game state for game {game_id}")
                         else:
+                            last_activity_time = time.time()
                             consecutive_unchanged += 1
                             
                     except json.JSONDecodeError:
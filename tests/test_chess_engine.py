@@ -0,0 +1,186 @@
+import json
+import os
+from collections import OrderedDict
+
+import chess
+import pytest
+
+import chess_engine
+from chess_engine import ChessEngine
+
+
+def write_save(directory, game_data):
+    path = os.path.join(directory, "game.json")
+    with open(path, "w") as f:
+        json.dump(game_data, f)
+    return path
+
+
+def test_load_resumed_game_without_initial_fen(tmp_path):
+    # Saves from before initial_fen was recorded only hold the moves made
+    # since the game was resumed, so replaying them from the start is wrong
+    board = chess.Board()
+    for move in ("e2e4", "e7e5"):
+        board.push_uci(move)
+    board = chess.Board(board.fen())
+    board.push_uci("g1f3")
+    game_data = {
+        "game_id": "resumed",
+        "fen": board.fen(),
+        # Also legal from the starting position, so it replays without error
+        "move_history": ["g1f3"],
+        "move_timestamps": {},
+    }
+    path = write_save(str(tmp_path), game_data)
+
+    engine = ChessEngine(load_path=path, autosave=False, autosave_dir=str(tmp_path))
+
+    assert engine.board.fen() == game_data["fen"]
+
+
+def test_load_non_starting_fen_with_empty_history(tmp_path):
+    fen = "4k3/8/8/8/8/8/4P3/4K3 w - - 0 1"
+    game_data = {
+        "game_id": "endgame",
+        "fen": fen,
+        "move_history": [],
+        "move_timestamps": {},
+    }
+    path = write_save(str(tmp_path), game_data)
+
+    engine = ChessEngine(load_path=path, autosave=False, autosave_dir=str(tmp_path))
+
+    assert engine.board.fen() == fen
+    assert engine.initial_fen == fen
+
+
+def test_load_replays_history_from_initial_fen(tmp_path):
+    engine = ChessEngine(autosave=False, autosave_dir=str(tmp_path), game_id="replay")
+    for move in ("e2e4", "e7e5", "g1f3"):
+        engine.make_move(move)
+    path = engine.save_game(os.path.join(str(tmp_path), "replay.json"))
+
+    loaded = ChessEngine(load_path=path, autosave=False, autosave_dir=str(tmp_path))
+
+    assert loaded.board.fen() == engine.board.fen()
+    assert [m.uci() for m in loaded.board.move_stack] == ["e2e4", "e7e5", "g1f3"]
+
+
+def test_save_after_taking_back_a_move(tmp_path):
+    engine = ChessEngine(autosave=True, autosave_dir=str(tmp_path), game_id="takeback")
+    engine.make_move("e2e4")
+    engine.make_move("e7e5")
+    # Same stack length as the last save, but a different last move
+    engine.board.pop()
+    engine.make_move("d7d5")
+
+    with open(engine.autosave_path) as f:
+        game_data = json.load(f)
+    loaded = ChessEngine(load_path=engine.autosave_path, autosave=False, autosave_dir=str(tmp_path))
+
+    assert game_data["move_history"] == ["e2e4", "d7d5"]
+    assert [m.uci() for m in loaded.board.move_stack] == ["e2e4", "d7d5"]
+    assert loaded.board.fen() == engine.board.fen()
+
+
+def play_game_over(tmp_path, fen=chess.STARTING_FEN, moves=()):
+    engine = ChessEngine(autosave=False, autosave_dir=str(tmp_path), game_id="over")
+    engine.board = chess.Board(fen)
+    for move in moves:
+        engine.board.push_uci(move)
+    return engine.is_game_over()
+
+
+# Four round trips of both knights repeat the starting position five times
+KNIGHT_SHUFFLE = ("g1f3", "g8f6", "f3g1", "f6g8") * 4
+
+
+@pytest.mark.parametrize("fen, moves, result, reason", [
+    (chess.STARTING_FEN, ("f2f3", "e7e5", "g2g4", "d8h4"), "0-1", "checkmate"),
+    ("7k/5Q2/6K1/8/8/8/8/8 b - - 0 1", (), "1/2-1/2", "stalemate"),
+    ("8/8/8/4k3/8/8/8/4K3 w - - 0 1", (), "1/2-1/2", "insufficient material"),
+    # Stalemated with only a bishop left, reported as stalemate
+    ("k7/2B5/1K6/8/8/8/8/8 b - - 0 1", (), "1/2-1/2", "stalemate"),
+    ("4k3/8/8/8/8/8/4P3/4K3 w - - 150 100", (), "1/2-1/2", "fifty-move rule"),
+    (chess.STARTING_FEN, KNIGHT_SHUFFLE, "1/2-1/2", "threefold repetition"),
+    # Fivefold repetition with more than fifty moves on the clock
+    ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 90 60", KNIGHT_SHUFFLE, "1/2-1/2", "fifty-move rule"),
+])
+def test_is_game_over_result_and_reason(tmp_path, fen, moves, result, reason):
+    assert play_game_over(tmp_path, fen, moves) == {'is_over': True, 'result': result, 'reason': reason}
+
+
+def test_is_game_over_in_progress(tmp_path):
+    assert play_game_over(tmp_path, moves=("e2e4",)) == {'is_over': False, 'result': None, 'reason': None}
+
+
+def test_iter_valid_moves_matches_valid_moves(tmp_path):
+    engine = ChessEngine(autosave=False, autosave_dir=str(tmp_path), game_id="moves")
+    # White can promote on b8 or capture onto a8 with the pawn
+    engine.board = chess.Board("r3k3/1P6/8/8/8/8/8/4K3 w - - 0 1")
+
+    moves = list(engine.iter_valid_moves())
+
+    assert sorted(chess.Move(*move).uci() for move in moves) == sorted(engine.get_valid_moves())
+    assert (chess.B7, chess.B8, chess.QUEEN) in moves
+    assert (chess.E1, chess.D1, None) in moves
+
+
+def test_eval_cache_is_shared_and_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(chess_engine, "_EVAL_CACHE", OrderedDict())
+    monkeypatch.setattr(chess_engine, "_EVAL_CACHE_SIZE", 2)
+    engine = ChessEngine(autosave=False, autosave_dir=str(tmp_path), game_id="cache")
+    keys = []
+    for move in ("e2e4", "e7e5", "g1f3"):
+        engine.make_move(move)
+        keys.append(engine.board._transposition_key())
+        engine.evaluate_position()
+
+    # Only the two most recent positions are kept
+    assert list(chess_engine._EVAL_CACHE) == keys[1:]
+
+    # Another engine reaching the same position reuses the entry
+    other = ChessEngine(autosave=False, autosave_dir=str(tmp_path), game_id="other")
+    other.board = engine.board.copy()
+    chess_engine._EVAL_CACHE[keys[2]] = 42.0
+    assert other.evaluate_position() == 42.0
+
+
+def test_autosave_round_trip_from_non_starting_fen(tmp_path):
+    fen = "4k3/8/8/8/8/8/4P3/4K3 w - - 0 1"
+    path = write_save(str(tmp_path), {"game_id": "resumed", "fen": fen, "move_history": []})
+    engine = ChessEngine(load_path=path, autosave=True, autosave_dir=str(tmp_path))
+    for move in ("e2e4", "e8d7", "e1d2"):
+        engine.make_move(move)
+
+    loaded = ChessEngine(load_path=engine.autosave_path, autosave=False, autosave_dir=str(tmp_path))
+
+    # The autosave was swapped in, nothing is left beside it
+    assert sorted(os.listdir(str(tmp_path))) == ["game.json", "game_id_resumed.json"]
+    assert loaded.initial_fen == fen
+    assert [m.uci() for m in loaded.board.move_stack] == ["e2e4", "e8d7", "e1d2"]
+    assert loaded.board.fen() == engine.board.fen()
+
+
+def test_evaluate_position_skips_mobility_outside_window(tmp_path, monkeypatch):
+    monkeypatch.setattr(chess_engine, "_EVAL_CACHE", OrderedDict())
+    engine = ChessEngine(autosave=False, autosave_dir=str(tmp_path), game_id="lazy")
+    # White is a queen and two rooks up, far above any mobility swing
+    engine.board = chess.Board("4k3/8/8/8/8/8/8/R2QK2R w - - 0 1")
+
+    lazy = engine.evaluate_position(beta=0.0)
+    assert not chess_engine._EVAL_CACHE
+    full = engine.evaluate_position()
+
+    assert lazy - chess_engine._MOBILITY_MARGIN > 0.0
+    assert lazy != full
+    assert abs(full - lazy) <= chess_engine._MOBILITY_MARGIN
+    assert engine.evaluate_position(alpha=full - 1, beta=full + 1) == full
+
+
+def test_evaluate_position_finds_mate_outside_window(tmp_path, monkeypatch):
+    monkeypatch.setattr(chess_engine, "_EVAL_CACHE", OrderedDict())
+    engine = ChessEngine(autosave=False, autosave_dir=str(tmp_path), game_id="mate")
+    engine.board = chess.Board("k7/1Q6/1K6/8/8/8/8/R6R b - - 0 1")
+
+    assert engine.evaluate_position(beta=0.0) == float('inf')